@@ -0,0 +1,182 @@
+"""Reproducible benchmarks for the simulation core and web API.
+
+Usage:
+    PYTHONPATH=src python benchmarks/run.py              # run and print timings
+    PYTHONPATH=src python benchmarks/run.py --save       # store timings as the baseline
+    PYTHONPATH=src python benchmarks/run.py --compare    # fail on regressions or missing baseline entries
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from hexcrawler.content import DEFAULT_CONTENT_PATH, load_content
+from hexcrawler.sim import Simulation
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+Setup = Callable[[], Callable[[], None]]
+
+
+def _world(seed: int, size: int, spawners: int) -> Simulation:
+    sim = Simulation(seed=seed, content=load_content(DEFAULT_CONTENT_PATH))
+    sim.init_world(size, size)
+    for i in range(spawners):
+        sim.place_spawner((i % size, (i * 7) % size), "wilds_basic", interval_ticks=20)
+    return sim
+
+
+def _populate(sim: Simulation, entities: int, events: int) -> None:
+    size = sim.world.width
+    actors = [sim.spawn_entity("scout" if i % 2 else "raider", (i % size, (i // size) % size)) for i in range(entities)]
+    for i in range(events):
+        sim.create_world_event("raid", (i % size, 0), actors[i % len(actors)], ((i * 3) % size, (i * 5) % size), ["tracks", "bodies"])
+
+
+def bench_simulate_days_small() -> Callable[[], None]:
+    sim = _world(seed=1, size=12, spawners=2)
+    return lambda: sim.simulate_days(1)
+
+
+def bench_simulate_days_large() -> Callable[[], None]:
+    sim = _world(seed=2, size=64, spawners=16)
+    return lambda: sim.simulate_days(1)
+
+
+def bench_attack_throughput() -> Callable[[], None]:
+    sim = _world(seed=3, size=12, spawners=0)
+    a = sim.spawn_entity("raider", (0, 0))
+    d = sim.spawn_entity("scout", (0, 1))
+
+    def run() -> None:
+        for i in range(10_000):
+            sim.attack(a, d, arc=("front", "side", "rear")[i % 3])
+
+    return run
+
+
+def bench_rumor_decay() -> Callable[[], None]:
+    sim = _world(seed=4, size=32, spawners=0)
+    actor = sim.spawn_entity("scout", (0, 0))
+
+    def run() -> None:
+        for i in range(5_000):
+            sim.create_world_event("raid", (i % 32, 0), actor, ((i * 3) % 32, (i * 5) % 32), ["tracks"])
+        sim.tick(600)
+
+    return run
+
+
+def bench_snapshot_large() -> Callable[[], None]:
+    sim = _world(seed=5, size=64, spawners=0)
+    _populate(sim, entities=5_000, events=2_000)
+    return sim.world.snapshot
+
+
+def bench_load_content() -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(200):
+            load_content(DEFAULT_CONTENT_PATH)
+
+    return run
+
+
+def bench_api_world() -> Callable[[], None]:
+    from hexcrawler.web.server import encode_json, world_payload
+
+    sim = _world(seed=6, size=64, spawners=32)
+    _populate(sim, entities=100, events=2_000)
+    # The full GET /api/world response path: payload, compact JSON, ETag and gzip.
+    return lambda: encode_json(world_payload(sim), "gzip", revalidate=True)
+
+
+BENCHMARKS: dict[str, Setup] = {
+    "simulate_days_small": bench_simulate_days_small,
+    "simulate_days_large": bench_simulate_days_large,
+    "attack_throughput": bench_attack_throughput,
+    "rumor_decay": bench_rumor_decay,
+    "snapshot_large": bench_snapshot_large,
+    "load_content": bench_load_content,
+    "api_world": bench_api_world,
+}
+
+
+def _sample(setup: Setup, min_time: float) -> float:
+    # Like timeit.Timer.autorange: keep calling until the timed total passes min_time, then
+    # report seconds per call. Each call gets a fresh setup (untimed) because most cases
+    # mutate their world, and the collector is paused while timing as timeit does.
+    total, calls = 0.0, 0
+    while total < min_time:
+        run = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            total += time.perf_counter() - start
+        finally:
+            gc.enable()
+        calls += 1
+    return total / calls
+
+
+def measure(setup: Setup, repeat: int, min_time: float = 0.2) -> dict[str, float]:
+    samples = [_sample(setup, min_time) for _ in range(repeat)]
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            regressions.append(f"{name}: no baseline entry (run with --save)")
+        elif result["min"] > base["min"] * (1 + tolerance):
+            regressions.append(f"{name}: regressed, {result['min']:.4f}s vs baseline {base['min']:.4f}s")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum timed seconds per sample")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this substring")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="exit non-zero if any benchmark regresses")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline min (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    if args.compare and not args.baseline.exists():
+        parser.error(f"baseline {args.baseline} not found; create it with --save")
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results: dict[str, dict[str, float]] = {}
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(setup, args.repeat, args.min_time)
+        line = f"{name:<22} min {results[name]['min']:.4f}s  median {results[name]['median']:.4f}s"
+        if name in baseline:
+            line += f"  ({results[name]['min'] / baseline[name]['min']:.2f}x baseline)"
+        print(line)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+    if args.compare:
+        regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"FAIL {r}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1 @@
-from .loader import ContentIndex, load_content
+from .loader import DEFAULT_CONTENT_PATH, ContentIndex, content_from_dict, load_content
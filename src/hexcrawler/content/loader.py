@@ -19,12 +19,18 @@ from .schemas import (
     WoundTypeDef,
 )
 
+DEFAULT_CONTENT_PATH = Path(__file__).resolve().parents[3] / "data" / "content.json"
+
 
 def _require(cond: bool, message: str) -> None:
     if not cond:
         raise ValueError(message)
 
 
+def require_rumor_max_hops(max_hops: int) -> None:
+    _require(1 <= max_hops <= 5, "Rumor max_hops must be 1..5")
+
+
 class ContentIndex:
     def __init__(self, bundle: ContentBundle):
         self.bundle = bundle
@@ -41,8 +47,10 @@ class ContentIndex:
 
 
 def load_content(path: str | Path) -> ContentIndex:
-    data = json.loads(Path(path).read_text())
+    return content_from_dict(json.loads(Path(path).read_text()))
+
 
+def content_from_dict(data: dict) -> ContentIndex:
     terrains = [TerrainDef(**t) for t in data["terrains"]]
     factions = [FactionDef(**f) for f in data["factions"]]
     entities = [
@@ -65,7 +73,8 @@ def load_content(path: str | Path) -> ContentIndex:
     rumor_templates = [RumorTemplateDef(**r) for r in data["rumor_templates"]]
 
     _require(all(0 < sum(bp.coverage for bp in e.body_parts) <= 1.01 for e in entities), "Entity body part coverage must sum to ~1")
-    _require(all(1 <= r.max_hops <= 5 for r in rumor_templates), "Rumor max_hops must be 1..5")
+    for r in rumor_templates:
+        require_rumor_max_hops(r.max_hops)
 
     bundle = ContentBundle(
         terrains=terrains,
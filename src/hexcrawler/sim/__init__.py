@@ -1 +1,3 @@
 from .engine import SimConfig, Simulation
+from .ids import Handle, IdTable
+from .persistence import load_simulation, save_simulation, simulation_from_dict, simulation_to_dict, write_json_atomic
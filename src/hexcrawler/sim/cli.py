@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from hexcrawler.content.loader import DEFAULT_CONTENT_PATH, load_content
+
+from .engine import Simulation
+from .persistence import simulation_from_dict, simulation_to_dict, write_json_atomic
+
+def world_stats(sim: Simulation) -> dict:
+    world = sim.world
+    return {
+        "tick": world.tick,
+        "entities": len(world.entities),
+        "tracks": len(world.tracks),
+        "rumors": len(world.rumors),
+        "events": len(world.events),
+        "sites": len(world.sites),
+        "spawners": len(world.spawners),
+        "regional_unrest": sum(world.regional_unrest.values()),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m hexcrawler.sim", description="Advance a world headlessly as fast as possible.")
+    parser.add_argument("--content", type=Path, default=DEFAULT_CONTENT_PATH, help="content JSON (default: data/content.json)")
+    parser.add_argument("--world", type=Path, help="saved world to load; a fresh world is created when omitted")
+    parser.add_argument("--seed", type=int, default=42, help="seed for a fresh world")
+    parser.add_argument("--size", type=int, default=12, help="width/height of a fresh world")
+    parser.add_argument("--days", type=int, default=1, help="days to simulate")
+    parser.add_argument("--checkpoint-every", type=int, default=0, metavar="DAYS", help="write a checkpoint every N days (0 = off)")
+    parser.add_argument("--checkpoint-dir", type=Path, default=Path("checkpoints"))
+    parser.add_argument("--out", type=Path, help="write the final world here")
+    parser.add_argument("--summary", type=Path, help="also write the run summary JSON here")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    content = load_content(args.content)
+
+    envelope: dict | None = None
+    if args.world:
+        data = json.loads(args.world.read_text())
+        # Worlds saved by the web server's registry wrap the simulation with session data.
+        if "simulation" in data:
+            envelope, data = data, data["simulation"]
+        sim = simulation_from_dict(data, content)
+    else:
+        sim = Simulation(seed=args.seed, content=content)
+        sim.init_world(args.size, args.size)
+
+    def dump() -> dict:
+        data = simulation_to_dict(sim)
+        return {**envelope, "simulation": data} if envelope is not None else data
+
+    # Rates are measured over simulate_days only; checkpoint writes are timed separately.
+    start_tick = sim.world.tick
+    checkpoints = []
+    elapsed = checkpoint_elapsed = 0.0
+    for day in range(1, args.days + 1):
+        started = time.perf_counter()
+        sim.simulate_days(1)
+        elapsed += time.perf_counter() - started
+        if args.checkpoint_every and day % args.checkpoint_every == 0:
+            started = time.perf_counter()
+            path = args.checkpoint_dir / f"tick_{sim.world.tick:09d}.json"
+            write_json_atomic(path, dump())
+            checkpoints.append(str(path))
+            checkpoint_elapsed += time.perf_counter() - started
+            rate = (sim.world.tick - start_tick) / elapsed if elapsed > 0 else 0
+            print(f"day {day}/{args.days} tick={sim.world.tick} {rate:,.0f} ticks/s -> {path}", file=sys.stderr)
+
+    if args.out:
+        write_json_atomic(args.out, dump())
+    ticks = sim.world.tick - start_tick
+    summary = {
+        "days": args.days,
+        "ticks": ticks,
+        "elapsed_seconds": round(elapsed, 4),
+        "ticks_per_second": round(ticks / elapsed, 1) if elapsed > 0 else None,
+        "realtime_factor": round(ticks * sim.config.tick_ms / 1000 / elapsed, 1) if elapsed > 0 else None,
+        "checkpoint_seconds": round(checkpoint_elapsed, 4),
+        "checkpoints": checkpoints,
+        "world": world_stats(sim),
+    }
+    if args.summary:
+        write_json_atomic(args.summary, summary)
+    print(json.dumps(summary, indent=2))
+    return 0
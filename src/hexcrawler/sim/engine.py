@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import copy
 import random
 from dataclasses import dataclass
 
-from hexcrawler.content.loader import ContentIndex
+from hexcrawler.content.loader import ContentIndex, require_rumor_max_hops
 
+from .ids import Handle, IdTable
 from .models import EntityState, PatrolRoute, RumorInstance, Site, Spawner, TrackObject, WorldEvent, WorldState, WoundInstance
 
 
@@ -16,55 +18,131 @@ class SimConfig:
     fatigue_interval_ticks: int = 25
     ai_interval_ticks: int = 15
     rumor_decay_interval_ticks: int = 10
+    region_size: int = 4
+    spawner_population_cap: int = 12
+    region_population_cap: int = 64
+    entity_pool_size: int = 256
 
 
 class Simulation:
     def __init__(self, seed: int, content: ContentIndex, config: SimConfig | None = None):
         self.rng = random.Random(seed)
         self.content = content
+        self.content_owned = False
         self.config = config or SimConfig()
         self.world = WorldState()
-        self._next_id = 1
-
-    def _id(self, prefix: str) -> str:
-        out = f"{prefix}_{self._next_id}"
-        self._next_id += 1
-        return out
+        self.ids = IdTable()
+        self._entity_pool: list[EntityState] = []
+        self._region_population: dict[tuple[int, int], int] = {}
+
+    def _id(self, prefix: str) -> Handle:
+        return self.ids.new(prefix)
+
+    def _editable_content(self) -> ContentIndex:
+        # Content may be shared between simulations; copy it before the first edit.
+        if not self.content_owned:
+            self.content = copy.deepcopy(self.content)
+            self.content_owned = True
+        return self.content
+
+    def _reindex(self) -> None:
+        self._region_population = {}
+        for ent in self.world.entities.values():
+            region = self._region_key(ent.hex)
+            self._region_population[region] = self._region_population.get(region, 0) + 1
+
+    def resolve(self, name: str) -> Handle:
+        handle = self.ids.parse(name)
+        objects = {
+            "ent": self.world.entities,
+            "track": self.world.tracks,
+            "rumor": self.world.rumors,
+            "event": self.world.events,
+            "site": self.world.sites,
+            "patrol": self.world.patrol_routes,
+            "spawn": self.world.spawners,
+        }.get(name.rpartition("_")[0])
+        if objects is None or handle not in objects:
+            raise KeyError(name)
+        return handle
+
+    def _region_key(self, at_hex: tuple[int, int]) -> tuple[int, int]:
+        size = self.config.region_size
+        return at_hex[0] // size, at_hex[1] // size
 
     def init_world(self, width: int = 12, height: int = 12, terrain_id: str = "plains") -> None:
         self.world.width = width
         self.world.height = height
         self.world.terrain = {(q, r): terrain_id for q in range(width) for r in range(height)}
 
-    def spawn_entity(self, template_id: str, at_hex: tuple[int, int]) -> str:
+    def spawn_entity(self, template_id: str, at_hex: tuple[int, int], spawner_id: Handle | None = None) -> Handle:
         t = self.content.entities[template_id]
         ent_id = self._id("ent")
-        self.world.entities[ent_id] = EntityState(
-            id=ent_id,
-            template_id=t.id,
-            faction_id=t.faction_id,
-            hex=at_hex,
-            mobility=t.mobility,
-            dexterity=t.dexterity,
-            armor_id=t.armor_id,
-            weapon_id=t.weapon_id,
-        )
+        if self._entity_pool:
+            ent = self._entity_pool.pop()
+            ent.id = ent_id
+            ent.template_id = t.id
+            ent.faction_id = t.faction_id
+            ent.hex = at_hex
+            ent.mobility = t.mobility
+            ent.dexterity = t.dexterity
+            ent.armor_id = t.armor_id
+            ent.weapon_id = t.weapon_id
+            ent.fatigue = 0
+            ent.stagger = 0
+            ent.spawner_id = spawner_id
+        else:
+            ent = EntityState(
+                id=ent_id,
+                template_id=t.id,
+                faction_id=t.faction_id,
+                hex=at_hex,
+                mobility=t.mobility,
+                dexterity=t.dexterity,
+                armor_id=t.armor_id,
+                weapon_id=t.weapon_id,
+                spawner_id=spawner_id,
+            )
+        self.world.entities[ent_id] = ent
+        region = self._region_key(at_hex)
+        self._region_population[region] = self._region_population.get(region, 0) + 1
+        if spawner_id is not None:
+            self.world.spawners[spawner_id].population.append(ent_id)
         return ent_id
 
-    def remove_entity(self, entity_id: str) -> None:
-        self.world.entities.pop(entity_id, None)
-
-    def place_site(self, kind: str, at_hex: tuple[int, int]) -> str:
+    def remove_entity(self, entity_id: Handle) -> None:
+        ent = self.world.entities.pop(entity_id, None)
+        if ent is None:
+            return
+        region = self._region_key(ent.hex)
+        self._region_population[region] -= 1
+        spawner = self.world.spawners.get(ent.spawner_id)
+        if spawner is not None:
+            spawner.population.remove(entity_id)
+        if len(self._entity_pool) < self.config.entity_pool_size:
+            ent.wounds.clear()
+            self._entity_pool.append(ent)
+
+    def place_site(self, kind: str, at_hex: tuple[int, int]) -> Handle:
         site_id = self._id("site")
         self.world.sites[site_id] = Site(id=site_id, kind=kind, hex=at_hex)
         return site_id
 
-    def add_patrol_route(self, points: list[tuple[int, int]]) -> str:
+    def add_patrol_route(self, points: list[tuple[int, int]]) -> Handle:
         rid = self._id("patrol")
         self.world.patrol_routes[rid] = PatrolRoute(id=rid, points=list(points))
         return rid
 
-    def place_spawner(self, at_hex: tuple[int, int], encounter_table_id: str, interval_ticks: int = 50) -> str:
+    def place_spawner(
+        self,
+        at_hex: tuple[int, int],
+        encounter_table_id: str,
+        interval_ticks: int = 50,
+        max_population: int | None = None,
+        cap_policy: str = "hold",
+    ) -> Handle:
+        if cap_policy not in ("hold", "recycle"):
+            raise ValueError(f"Unknown spawner cap policy: {cap_policy}")
         sid = self._id("spawn")
         self.world.spawners[sid] = Spawner(
             id=sid,
@@ -72,13 +150,15 @@ class Simulation:
             encounter_table_id=encounter_table_id,
             interval_ticks=interval_ticks,
             next_spawn_tick=self.world.tick + interval_ticks,
+            max_population=max_population,
+            cap_policy=cap_policy,
         )
         return sid
 
     def paint_terrain(self, at_hex: tuple[int, int], terrain_id: str) -> None:
         self.world.terrain[at_hex] = terrain_id
 
-    def create_world_event(self, event_type: str, source_hex: tuple[int, int], actor_entity_id: str, target_hex: tuple[int, int], evidence_types: list[str]) -> str:
+    def create_world_event(self, event_type: str, source_hex: tuple[int, int], actor_entity_id: Handle, target_hex: tuple[int, int], evidence_types: list[str]) -> Handle:
         eid = self._id("event")
         event = WorldEvent(
             id=eid,
@@ -94,13 +174,13 @@ class Simulation:
         self._create_rumor(event)
         return eid
 
-    def discover_track(self, entity_id: str, track_id: str) -> bool:
+    def discover_track(self, entity_id: Handle, track_id: Handle) -> bool:
         if entity_id not in self.world.entities or track_id not in self.world.tracks:
             return False
         self.world.tracks[track_id].discovered_by.add(entity_id)
         return True
 
-    def validate_track(self, entity_id: str, track_id: str) -> bool:
+    def validate_track(self, entity_id: Handle, track_id: Handle) -> bool:
         track = self.world.tracks.get(track_id)
         if not track or entity_id not in track.discovered_by:
             return False
@@ -135,28 +215,37 @@ class Simulation:
             known_by={event.actor_entity_id},
         )
 
+    def update_encounter_weight(self, table_id: str, weight: int, entry_index: int = 0) -> None:
+        entries = self.content.encounter_tables[table_id].entries
+        if weight < 0 or sum(e.weight for i, e in enumerate(entries) if i != entry_index) + weight <= 0:
+            raise ValueError("Encounter weights must be non-negative with a positive total")
+        self._editable_content().encounter_tables[table_id].entries[entry_index].weight = weight
+
     def update_rumor_template(self, template_id: str, ttl_ticks: int, max_hops: int) -> None:
-        template = self.content.rumor_templates[template_id]
+        require_rumor_max_hops(max_hops)
+        template = self._editable_content().rumor_templates[template_id]
         template.ttl_ticks = ttl_ticks
         template.max_hops = max_hops
 
     def update_weapon(self, weapon_id: str, penetration: int) -> None:
-        self.content.weapons[weapon_id].penetration = penetration
+        self._editable_content().weapons[weapon_id].penetration = penetration
 
     def update_armor_threshold(self, armor_id: str, damage_type: str, arc: str, value: int) -> None:
-        setattr(self.content.armors[armor_id].thresholds[damage_type], arc, value)
+        if arc not in ("front", "side", "rear"):
+            raise ValueError(f"Unknown armor arc: {arc}")
+        setattr(self._editable_content().armors[armor_id].thresholds[damage_type], arc, value)
 
     def update_wound_type(self, wound_type_id: str, mobility_delta: int, dexterity_delta: int) -> None:
-        wt = self.content.wound_types[wound_type_id]
+        wt = self._editable_content().wound_types[wound_type_id]
         wt.mobility_delta = mobility_delta
         wt.dexterity_delta = dexterity_delta
 
     def update_faction_settlement(self, faction_id: str, settlement: str) -> None:
-        faction = self.content.factions[faction_id]
+        faction = self._editable_content().factions[faction_id]
         if settlement not in faction.settlements:
             faction.settlements.append(settlement)
 
-    def attack(self, attacker_id: str, defender_id: str, arc: str = "front") -> dict:
+    def attack(self, attacker_id: Handle, defender_id: Handle, arc: str = "front") -> dict:
         attacker = self.world.entities[attacker_id]
         defender = self.world.entities[defender_id]
         weapon = self.content.weapons[attacker.weapon_id]
@@ -198,7 +287,7 @@ class Simulation:
         defender.mobility += wound_type.mobility_delta
         defender.dexterity += wound_type.dexterity_delta
 
-    def treat_wound(self, entity_id: str) -> bool:
+    def treat_wound(self, entity_id: Handle) -> bool:
         entity = self.world.entities[entity_id]
         untreated = [w for w in entity.wounds if not w.treated]
         if not untreated:
@@ -219,9 +308,10 @@ class Simulation:
             if rumor.hops < template.max_hops and self.world.tick % self.config.ai_interval_ticks == 0:
                 rumor.hops += 1
                 rumor.confidence = max(0.1, rumor.confidence - 0.1)
-                rumor.known_by.add(f"hop_{rumor.hops}")
+                rumor.known_by.add(self.ids.intern(f"hop_{rumor.hops}"))
             if rumor.hops >= template.max_hops:
-                region_key = f"{rumor.source_hex[0]//4},{rumor.source_hex[1]//4}"
+                region = self._region_key(rumor.source_hex)
+                region_key = f"{region[0]},{region[1]}"
                 self.world.regional_unrest[region_key] = self.world.regional_unrest.get(region_key, 0) + 1
         for rid in to_delete:
             del self.world.rumors[rid]
@@ -237,9 +327,22 @@ class Simulation:
                     remaining.append(w)
             e.wounds = remaining
 
+    def _spawner_has_room(self, sp: Spawner) -> bool:
+        cap = sp.max_population if sp.max_population is not None else self.config.spawner_population_cap
+        region_full = self._region_population.get(self._region_key(sp.hex), 0) >= self.config.region_population_cap
+        if len(sp.population) < cap and not region_full:
+            return True
+        if sp.cap_policy == "recycle" and sp.population:
+            self.remove_entity(sp.population[0])
+            return True
+        return False
+
     def _tick_spawners(self) -> None:
         for sp in self.world.spawners.values():
             if self.world.tick >= sp.next_spawn_tick:
+                sp.next_spawn_tick = self.world.tick + sp.interval_ticks
+                if not self._spawner_has_room(sp):
+                    continue
                 table = self.content.encounter_tables[sp.encounter_table_id]
                 roll = self.rng.randint(1, sum(e.weight for e in table.entries))
                 accum = 0
@@ -249,8 +352,7 @@ class Simulation:
                     if roll <= accum:
                         pick = entry.entity_template_id
                         break
-                self.spawn_entity(pick, sp.hex)
-                sp.next_spawn_tick = self.world.tick + sp.interval_ticks
+                self.spawn_entity(pick, sp.hex, spawner_id=sp.id)
 
     def tick(self, steps: int = 1) -> None:
         for _ in range(steps):
@@ -0,0 +1,253 @@
+"""Seeded scenario fuzzing for simulation determinism.
+
+A scenario is a list of command tuples. Each scenario is replayed twice on
+the reference engine and once on every other engine path; state digests
+taken at ``("checkpoint",)`` commands must agree across all runs. Failing
+scenarios are shrunk to a minimal command list.
+
+    PYTHONPATH=src python -m hexcrawler.sim.fuzz --runs 200 --length 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from hexcrawler.content.loader import DEFAULT_CONTENT_PATH, ContentIndex, load_content
+
+from .engine import SimConfig, Simulation
+from .ids import Handle
+from .persistence import simulation_from_dict, simulation_to_dict
+
+Command = tuple
+WORLD_SIZE = 12
+ARCS = ("front", "side", "rear")
+
+
+def generate_commands(seed: int, length: int, content: ContentIndex) -> list[Command]:
+    rng = random.Random(seed)
+    templates = sorted(content.entities)
+    event_types = sorted(content.rumor_by_event) + ["ambush"]
+    evidence = ["tracks", "bodies", "blood"]
+
+    def hex_() -> tuple[int, int]:
+        return rng.randrange(WORLD_SIZE), rng.randrange(WORLD_SIZE)
+
+    makers: list[tuple[int, Callable[[], Command]]] = [
+        (6, lambda: ("spawn", rng.choice(templates), *hex_())),
+        (2, lambda: ("remove", rng.randrange(64))),
+        (6, lambda: ("attack", rng.randrange(64), rng.randrange(64), rng.choice(ARCS))),
+        (2, lambda: ("treat", rng.randrange(64))),
+        (4, lambda: ("event", rng.choice(event_types), *hex_(), rng.randrange(64), *hex_(), tuple(rng.sample(evidence, rng.randint(1, 3))))),
+        (2, lambda: ("discover", rng.randrange(64), rng.randrange(64))),
+        (2, lambda: ("validate", rng.randrange(64), rng.randrange(64))),
+        (3, lambda: ("paint", *hex_(), rng.choice(sorted(content.terrain)))),
+        (1, lambda: ("site", rng.choice(("dungeon", "town", "ruin")), *hex_())),
+        (2, lambda: ("spawner", *hex_(), rng.choice(sorted(content.encounter_tables)), rng.randint(1, 30), rng.choice((None, 1, 3, 8)), rng.choice(("hold", "recycle")))),
+        (1, lambda: ("route", *hex_(), *hex_())),
+        (1, lambda: ("weapon", rng.choice(sorted(content.weapons)), rng.randint(0, 10))),
+        (1, lambda: ("armor", rng.choice(sorted(content.armors)), rng.choice(("pierce", "cut", "blunt")), rng.choice(ARCS), rng.randint(0, 10))),
+        (1, lambda: ("wound", rng.choice(sorted(content.wound_types)), rng.randint(-3, 0), rng.randint(-3, 0))),
+        (1, lambda: ("rumor_template", rng.choice(sorted(content.rumor_templates)), rng.randint(5, 200), rng.randint(1, 5))),
+        (1, lambda: ("encounter", rng.choice(sorted(content.encounter_tables)), rng.randint(1, 5))),
+        (1, lambda: ("faction", rng.choice(sorted(content.factions)), f"{rng.randrange(WORLD_SIZE)},{rng.randrange(WORLD_SIZE)}")),
+        (8, lambda: ("tick", rng.choice((1, 1, 5, 15, 60, 250)))),
+        (2, lambda: ("checkpoint",)),
+    ]
+    weights = [w for w, _ in makers]
+    commands = [rng.choices(makers, weights)[0][1]() for _ in range(length)]
+    commands.append(("checkpoint",))
+    return commands
+
+
+def _pick(handles: dict, index: int) -> Handle | None:
+    if not handles:
+        return None
+    return sorted(handles)[index % len(handles)]
+
+
+def apply_command(sim: Simulation, cmd: Command) -> None:
+    op, args = cmd[0], cmd[1:]
+    world = sim.world
+    if op == "spawn":
+        sim.spawn_entity(args[0], (args[1], args[2]))
+    elif op == "remove":
+        ent = _pick(world.entities, args[0])
+        if ent is not None:
+            sim.remove_entity(ent)
+    elif op == "attack":
+        a, d = _pick(world.entities, args[0]), _pick(world.entities, args[1])
+        if a is not None and a != d:
+            sim.attack(a, d, arc=args[2])
+    elif op == "treat":
+        ent = _pick(world.entities, args[0])
+        if ent is not None:
+            sim.treat_wound(ent)
+    elif op == "event":
+        actor = _pick(world.entities, args[3])
+        if actor is not None:
+            sim.create_world_event(args[0], (args[1], args[2]), actor, (args[4], args[5]), list(args[6]))
+    elif op in ("discover", "validate"):
+        ent, track = _pick(world.entities, args[0]), _pick(world.tracks, args[1])
+        if ent is not None and track is not None:
+            (sim.discover_track if op == "discover" else sim.validate_track)(ent, track)
+    elif op == "paint":
+        sim.paint_terrain((args[0], args[1]), args[2])
+    elif op == "site":
+        sim.place_site(args[0], (args[1], args[2]))
+    elif op == "spawner":
+        sim.place_spawner((args[0], args[1]), args[2], args[3], args[4], args[5])
+    elif op == "route":
+        sim.add_patrol_route([(args[0], args[1]), (args[2], args[3])])
+    elif op == "weapon":
+        sim.update_weapon(*args)
+    elif op == "armor":
+        sim.update_armor_threshold(*args)
+    elif op == "wound":
+        sim.update_wound_type(*args)
+    elif op == "rumor_template":
+        sim.update_rumor_template(*args)
+    elif op == "encounter":
+        sim.update_encounter_weight(*args)
+    elif op == "faction":
+        sim.update_faction_settlement(*args)
+    elif op == "tick":
+        sim.tick(args[0])
+    elif op != "checkpoint":
+        raise ValueError(f"Unknown fuzz command: {op}")
+
+
+def state_digest(sim: Simulation) -> str:
+    payload = repr(
+        (
+            sim.world.snapshot(),
+            sim.rng.getstate(),
+            [sim.ids.name(h) for h in sorted(sim.world.entities)],
+            [asdict(s) for _, s in sorted(sim.world.spawners.items())],
+            asdict(sim.content.bundle),
+        )
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_commands(
+    commands: list[Command],
+    seed: int,
+    content: ContentIndex,
+    config: SimConfig | None = None,
+    roundtrip: bool = False,
+) -> list[str]:
+    sim = Simulation(seed=seed, content=content, config=config)
+    sim.init_world(WORLD_SIZE, WORLD_SIZE)
+    digests = []
+    for cmd in commands:
+        apply_command(sim, cmd)
+        if cmd[0] == "checkpoint":
+            digests.append(state_digest(sim))
+            if roundtrip:
+                sim = simulation_from_dict(json.loads(json.dumps(simulation_to_dict(sim))), content)
+    return digests
+
+
+EnginePath = Callable[[list[Command], int, ContentIndex], list[str]]
+
+ENGINE_PATHS: dict[str, EnginePath] = {
+    "reference": lambda cmds, seed, content: run_commands(cmds, seed, content, SimConfig(entity_pool_size=0)),
+    "pooled": lambda cmds, seed, content: run_commands(cmds, seed, content),
+    "save_restore": lambda cmds, seed, content: run_commands(cmds, seed, content, roundtrip=True),
+}
+
+
+@dataclass
+class Divergence:
+    kind: str  # diverging engine path name, or exception type name for crashes
+    reason: str
+
+
+def find_divergence(commands: list[Command], seed: int, content: ContentIndex, paths: dict[str, EnginePath] | None = None) -> Divergence | None:
+    paths = paths or ENGINE_PATHS
+    try:
+        expected = paths["reference"](commands, seed, content)
+        runs = [("reference (rerun)", paths["reference"](commands, seed, content))]
+        runs += [(name, run(commands, seed, content)) for name, run in paths.items() if name != "reference"]
+    except Exception as exc:  # a crash on a generated scenario is a finding too
+        return Divergence(type(exc).__name__, f"{type(exc).__name__}: {exc}")
+    for name, digests in runs:
+        for i, (want, got) in enumerate(zip(expected, digests)):
+            if want != got:
+                return Divergence(name, f"{name} diverges from reference at checkpoint {i}")
+        if len(digests) != len(expected):
+            return Divergence(name, f"{name} produced {len(digests)} checkpoints, reference {len(expected)}")
+    return None
+
+
+def shrink(commands: list[Command], fails: Callable[[list[Command]], bool]) -> list[Command]:
+    current = list(commands)
+    chunk = max(1, len(current) // 2)
+    while chunk >= 1:
+        i, removed = 0, False
+        while i < len(current):
+            candidate = current[:i] + current[i + chunk:]
+            if candidate and fails(candidate):
+                current, removed = candidate, True
+            else:
+                i += chunk
+        if not removed:
+            chunk //= 2
+    return current
+
+
+@dataclass
+class FuzzFailure:
+    seed: int
+    kind: str
+    reason: str
+    commands: list[Command]
+
+
+def _same_failure(kind: str, seed: int, content: ContentIndex, paths: dict[str, EnginePath] | None) -> Callable[[list[Command]], bool]:
+    def fails(commands: list[Command]) -> bool:
+        found = find_divergence(commands + [("checkpoint",)], seed, content, paths)
+        return found is not None and found.kind == kind
+
+    return fails
+
+
+def fuzz(seeds: range, length: int, content: ContentIndex, paths: dict[str, EnginePath] | None = None) -> list[FuzzFailure]:
+    failures = []
+    for seed in seeds:
+        commands = generate_commands(seed, length, content)
+        found = find_divergence(commands, seed, content, paths)
+        if found is None:
+            continue
+        minimal = shrink(commands, _same_failure(found.kind, seed, content, paths))
+        failures.append(FuzzFailure(seed=seed, kind=found.kind, reason=found.reason, commands=minimal + [("checkpoint",)]))
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m hexcrawler.sim.fuzz", description="Fuzz simulation determinism across engine paths.")
+    parser.add_argument("--content", type=Path, default=DEFAULT_CONTENT_PATH)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--length", type=int, default=120, help="commands per scenario")
+    parser.add_argument("--start-seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    content = load_content(args.content)
+    failures = fuzz(range(args.start_seed, args.start_seed + args.runs), args.length, content)
+    for f in failures:
+        print(f"seed {f.seed}: {f.reason}")
+        for cmd in f.commands:
+            print(f"    {cmd!r}")
+    print(f"{args.runs - len(failures)}/{args.runs} scenarios deterministic across {', '.join(ENGINE_PATHS)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+Handle = int
+
+PREFIX_BITS = 8
+
+
+class IdTable:
+    """Integer handles for simulation objects with string names for display.
+
+    Generated handles are positive: a shared counter (1, 2, ...) in the high
+    bits and the prefix's index in the low ``PREFIX_BITS`` bits, so storage is
+    per prefix rather than per allocation and handles still sort by creation
+    order. Their display name is ``f"{prefix}_{counter}"``, built only when
+    asked for. Arbitrary strings (e.g. rumor hop markers) are interned to
+    negative handles.
+    """
+
+    def __init__(self) -> None:
+        self._next = 1
+        self._prefixes: list[str] = []
+        self._prefix_codes: dict[str, int] = {}
+        self._literals: list[str] = [""]
+        self._interned: dict[str, Handle] = {}
+
+    def _prefix_code(self, prefix: str) -> int:
+        code = self._prefix_codes.get(prefix)
+        if code is None:
+            if len(self._prefixes) >= 1 << PREFIX_BITS:
+                raise ValueError(f"Too many id prefixes (max {1 << PREFIX_BITS})")
+            code = len(self._prefixes)
+            self._prefixes.append(prefix)
+            self._prefix_codes[prefix] = code
+        return code
+
+    def new(self, prefix: str) -> Handle:
+        handle = (self._next << PREFIX_BITS) | self._prefix_code(prefix)
+        self._next += 1
+        return handle
+
+    def intern(self, name: str) -> Handle:
+        handle = self._interned.get(name)
+        if handle is None:
+            self._literals.append(name)
+            handle = -(len(self._literals) - 1)
+            self._interned[name] = handle
+        return handle
+
+    def name(self, handle: Handle) -> str:
+        if handle < 0:
+            return self._literals[-handle]
+        return f"{self._prefixes[handle & ((1 << PREFIX_BITS) - 1)]}_{handle >> PREFIX_BITS}"
+
+    def parse(self, name: str) -> Handle:
+        # Decodes the name only: a well-formed name that was never issued still parses.
+        # Use Simulation.resolve to look names up against live world objects.
+        if name in self._interned:
+            return self._interned[name]
+        prefix, _, number = name.rpartition("_")
+        code = self._prefix_codes.get(prefix)
+        if code is not None and number.isdigit() and 0 < int(number) < self._next:
+            return (int(number) << PREFIX_BITS) | code
+        raise KeyError(name)
+
+    def to_dict(self) -> dict:
+        return {"next": self._next, "prefixes": list(self._prefixes), "literals": self._literals[1:]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> IdTable:
+        table = cls()
+        table._next = data["next"]
+        for prefix in data["prefixes"]:
+            table._prefix_code(prefix)
+        for name in data["literals"]:
+            table.intern(name)
+        return table
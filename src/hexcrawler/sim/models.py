@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Literal
 
+from .ids import Handle
+
 Hex = tuple[int, int]
 
 
@@ -19,7 +21,7 @@ class WoundInstance:
 
 @dataclass
 class EntityState:
-    id: str
+    id: Handle
     template_id: str
     faction_id: str
     hex: Hex
@@ -30,39 +32,40 @@ class EntityState:
     wounds: list[WoundInstance] = field(default_factory=list)
     fatigue: int = 0
     stagger: int = 0
+    spawner_id: Handle | None = None
 
 
 @dataclass
 class TrackObject:
-    id: str
-    event_id: str
+    id: Handle
+    event_id: Handle
     hex: Hex
     evidence_type: str
     created_tick: int
-    discovered_by: set[str] = field(default_factory=set)
-    validated_by: set[str] = field(default_factory=set)
+    discovered_by: set[Handle] = field(default_factory=set)
+    validated_by: set[Handle] = field(default_factory=set)
 
 
 @dataclass
 class RumorInstance:
-    id: str
+    id: Handle
     template_id: str
-    event_id: str
+    event_id: Handle
     text: str
     confidence: float
     ttl_ticks: int
     evidence_types: list[str]
     hops: int = 0
     source_hex: Hex = (0, 0)
-    known_by: set[str] = field(default_factory=set)
+    known_by: set[Handle] = field(default_factory=set)
 
 
 @dataclass
 class WorldEvent:
-    id: str
+    id: Handle
     event_type: str
     source_hex: Hex
-    actor_entity_id: str
+    actor_entity_id: Handle
     target_hex: Hex
     evidence_types: list[str]
     tick: int
@@ -70,24 +73,27 @@ class WorldEvent:
 
 @dataclass
 class Site:
-    id: str
+    id: Handle
     kind: Literal["dungeon", "town", "ruin"]
     hex: Hex
 
 
 @dataclass
 class PatrolRoute:
-    id: str
+    id: Handle
     points: list[Hex]
 
 
 @dataclass
 class Spawner:
-    id: str
+    id: Handle
     hex: Hex
     encounter_table_id: str
     interval_ticks: int
     next_spawn_tick: int
+    max_population: int | None = None
+    cap_policy: Literal["hold", "recycle"] = "hold"
+    population: list[Handle] = field(default_factory=list)
 
 
 @dataclass
@@ -96,13 +102,13 @@ class WorldState:
     width: int = 12
     height: int = 12
     terrain: dict[Hex, str] = field(default_factory=dict)
-    entities: dict[str, EntityState] = field(default_factory=dict)
-    tracks: dict[str, TrackObject] = field(default_factory=dict)
-    rumors: dict[str, RumorInstance] = field(default_factory=dict)
-    events: dict[str, WorldEvent] = field(default_factory=dict)
-    sites: dict[str, Site] = field(default_factory=dict)
-    patrol_routes: dict[str, PatrolRoute] = field(default_factory=dict)
-    spawners: dict[str, Spawner] = field(default_factory=dict)
+    entities: dict[Handle, EntityState] = field(default_factory=dict)
+    tracks: dict[Handle, TrackObject] = field(default_factory=dict)
+    rumors: dict[Handle, RumorInstance] = field(default_factory=dict)
+    events: dict[Handle, WorldEvent] = field(default_factory=dict)
+    sites: dict[Handle, Site] = field(default_factory=dict)
+    patrol_routes: dict[Handle, PatrolRoute] = field(default_factory=dict)
+    spawners: dict[Handle, Spawner] = field(default_factory=dict)
     regional_unrest: dict[str, int] = field(default_factory=dict)
 
     def snapshot(self) -> dict:
@@ -131,5 +137,6 @@ class WorldState:
             "events": tuple(sorted((e.id, e.event_type, e.source_hex, e.tick) for e in self.events.values())),
             "sites": tuple(sorted((s.id, s.kind, s.hex) for s in self.sites.values())),
             "patrol_routes": tuple(sorted((p.id, tuple(p.points)) for p in self.patrol_routes.values())),
+            "spawners": tuple(sorted((s.id, s.hex, s.encounter_table_id, s.next_spawn_tick, tuple(s.population)) for s in self.spawners.values())),
             "regional_unrest": tuple(sorted(self.regional_unrest.items())),
         }
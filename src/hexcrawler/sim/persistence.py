@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from hexcrawler.content.loader import ContentIndex, content_from_dict
+
+from .engine import SimConfig, Simulation
+from .ids import IdTable
+from .models import EntityState, PatrolRoute, RumorInstance, Site, Spawner, TrackObject, WorldEvent, WorldState, WoundInstance
+
+FORMAT_VERSION = 2
+
+
+def _world_to_dict(world: WorldState) -> dict:
+    return {
+        "tick": world.tick,
+        "width": world.width,
+        "height": world.height,
+        "terrain": [[q, r, t] for (q, r), t in world.terrain.items()],
+        "entities": [asdict(e) for e in world.entities.values()],
+        "tracks": [{**asdict(t), "discovered_by": sorted(t.discovered_by), "validated_by": sorted(t.validated_by)} for t in world.tracks.values()],
+        "rumors": [{**asdict(r), "known_by": sorted(r.known_by)} for r in world.rumors.values()],
+        "events": [asdict(e) for e in world.events.values()],
+        "sites": [asdict(s) for s in world.sites.values()],
+        "patrol_routes": [asdict(p) for p in world.patrol_routes.values()],
+        "spawners": [asdict(s) for s in world.spawners.values()],
+        "regional_unrest": world.regional_unrest,
+    }
+
+
+def _world_from_dict(data: dict) -> WorldState:
+    entities = [
+        EntityState(**{**e, "hex": tuple(e["hex"]), "wounds": [WoundInstance(**w) for w in e["wounds"]]})
+        for e in data["entities"]
+    ]
+    tracks = [
+        TrackObject(**{**t, "hex": tuple(t["hex"]), "discovered_by": set(t["discovered_by"]), "validated_by": set(t["validated_by"])})
+        for t in data["tracks"]
+    ]
+    rumors = [RumorInstance(**{**r, "source_hex": tuple(r["source_hex"]), "known_by": set(r["known_by"])}) for r in data["rumors"]]
+    events = [WorldEvent(**{**e, "source_hex": tuple(e["source_hex"]), "target_hex": tuple(e["target_hex"])}) for e in data["events"]]
+    sites = [Site(**{**s, "hex": tuple(s["hex"])}) for s in data["sites"]]
+    routes = [PatrolRoute(id=p["id"], points=[tuple(pt) for pt in p["points"]]) for p in data["patrol_routes"]]
+    spawners = [Spawner(**{**s, "hex": tuple(s["hex"])}) for s in data["spawners"]]
+    return WorldState(
+        tick=data["tick"],
+        width=data["width"],
+        height=data["height"],
+        terrain={(q, r): t for q, r, t in data["terrain"]},
+        entities={e.id: e for e in entities},
+        tracks={t.id: t for t in tracks},
+        rumors={r.id: r for r in rumors},
+        events={e.id: e for e in events},
+        sites={s.id: s for s in sites},
+        patrol_routes={p.id: p for p in routes},
+        spawners={s.id: s for s in spawners},
+        regional_unrest=dict(data["regional_unrest"]),
+    )
+
+
+def simulation_to_dict(sim: Simulation) -> dict:
+    version, state, gauss = sim.rng.getstate()
+    return {
+        "format_version": FORMAT_VERSION,
+        "config": asdict(sim.config),
+        "rng_state": [version, list(state), gauss],
+        "ids": sim.ids.to_dict(),
+        "world": _world_to_dict(sim.world),
+        "content": asdict(sim.content.bundle) if sim.content_owned else None,
+    }
+
+
+def simulation_from_dict(data: dict, content: ContentIndex) -> Simulation:
+    if data.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported save format version: {data.get('format_version')}")
+    own_content = data["content"] is not None
+    sim = Simulation(seed=0, content=content_from_dict(data["content"]) if own_content else content, config=SimConfig(**data["config"]))
+    sim.content_owned = own_content
+    version, state, gauss = data["rng_state"]
+    sim.rng.setstate((version, tuple(state), gauss))
+    sim.ids = IdTable.from_dict(data["ids"])
+    sim.world = _world_from_dict(data["world"])
+    sim._reindex()
+    return sim
+
+
+def write_json_atomic(path: str | Path, data: dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.replace(path)
+
+
+def save_simulation(sim: Simulation, path: str | Path) -> None:
+    write_json_atomic(path, simulation_to_dict(sim))
+
+
+def load_simulation(path: str | Path, content: ContentIndex) -> Simulation:
+    return simulation_from_dict(json.loads(Path(path).read_text()), content)
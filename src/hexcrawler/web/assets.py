@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass
+class Asset:
+    body: bytes
+    gzipped: bytes
+    etag: str
+    ctype: str
+    mtime_ns: int
+    size: int
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    qualities: dict[str, float] = {}
+    for token in (accept_encoding or "").split(","):
+        coding, *params = (part.strip() for part in token.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            qualities[coding.lower()] = q
+    # An explicit gzip entry wins over the * wildcard.
+    q = qualities.get("gzip", qualities.get("*", 0.0))
+    return q > 0
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored.
+    for token in (if_none_match or "").split(","):
+        token = token.strip()
+        if token == "*" or token.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class AssetCache:
+    """Static files held in memory (plain and gzipped), reloaded when their mtime or size changes."""
+
+    def __init__(self) -> None:
+        self._assets: dict[Path, Asset] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, ctype: str) -> Asset:
+        st = path.stat()
+        asset = self._assets.get(path)
+        if asset is not None and asset.mtime_ns == st.st_mtime_ns and asset.size == st.st_size:
+            return asset
+        body = path.read_bytes()
+        asset = Asset(
+            body=body,
+            gzipped=gzip.compress(body, mtime=0),
+            etag=make_etag(body),
+            ctype=ctype,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+        )
+        with self._lock:
+            self._assets[path] = asset
+        return asset
@@ -1,105 +1,245 @@
 from __future__ import annotations
 
+import gzip
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import os
+import signal
+import sys
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
-from hexcrawler.content import load_content
+from hexcrawler.content import DEFAULT_CONTENT_PATH, load_content
 from hexcrawler.sim import Simulation
 
+from .assets import GZIP_MIN_BYTES, AssetCache, accepts_gzip, etag_matches, make_etag
+from .worlds import UnknownWorldError, WorldRegistry, WorldSession
+
 ROOT = Path(__file__).resolve().parent
-CONTENT = load_content(Path(__file__).resolve().parents[3] / "data" / "content.json")
-SIM = Simulation(seed=42, content=CONTENT)
-SIM.init_world()
-PLAYER_ID = SIM.spawn_entity("scout", (0, 0))
+REPO_ROOT = Path(__file__).resolve().parents[3]
+CONTENT = load_content(DEFAULT_CONTENT_PATH)
+REGISTRY = WorldRegistry(
+    CONTENT,
+    os.environ.get("HEXCRAWLER_WORLDS_DIR", REPO_ROOT / "worlds"),
+    max_resident=int(os.environ.get("HEXCRAWLER_MAX_RESIDENT_WORLDS", "8")),
+)
+DEFAULT_WORLD = "default"
+COMMAND_ROUTES = frozenset(
+    {
+        "/api/paint",
+        "/api/site",
+        "/api/spawner",
+        "/api/route",
+        "/api/encounter",
+        "/api/rumor-template",
+        "/api/weapon",
+        "/api/armor",
+        "/api/wound",
+        "/api/faction",
+        "/api/simulate",
+        "/api/play",
+    }
+)
+ASSETS = AssetCache()
+ASSET_ROUTES = {
+    "/": (ROOT / "templates" / "editor.html", "text/html"),
+    "/play": (ROOT / "templates" / "play.html", "text/html"),
+    "/static/editor.js": (ROOT / "static" / "editor.js", "application/javascript"),
+}
+
+
+def world_payload(sim: Simulation) -> dict:
+    return {
+        "tick": sim.world.tick,
+        "terrain": [{"q": q, "r": r, "t": t} for (q, r), t in sim.world.terrain.items()],
+        "sites": [{"id": sim.ids.name(s.id), "kind": s.kind, "q": s.hex[0], "r": s.hex[1]} for s in sim.world.sites.values()],
+        "spawners": [{"id": sim.ids.name(s.id), "q": s.hex[0], "r": s.hex[1], "table": s.encounter_table_id} for s in sim.world.spawners.values()],
+        "routes": [{"id": sim.ids.name(p.id), "points": p.points} for p in sim.world.patrol_routes.values()],
+        "rumors": [r.text for r in sim.world.rumors.values()],
+        "tracks": [{"id": sim.ids.name(t.id), "q": t.hex[0], "r": t.hex[1], "e": t.evidence_type} for t in sim.world.tracks.values()],
+        "regional_unrest": sim.world.regional_unrest,
+    }
+
+
+@dataclass
+class Encoded:
+    body: bytes | None  # None when the presented validator matched (send 304)
+    etag: str | None
+    compressible: bool
+    gzipped: bool
+
+
+def encode_body(
+    payload: bytes,
+    accept_encoding: str | None,
+    if_none_match: str | None = None,
+    etag: str | None = None,
+    gzipped: bytes | None = None,
+) -> Encoded:
+    compressible = len(payload) >= GZIP_MIN_BYTES
+    encoded = compressible and accepts_gzip(accept_encoding)
+    if etag is not None and encoded:
+        # The gzip body is a different representation and needs its own strong validator.
+        etag = etag[:-1] + '-gzip"'
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Encoded(None, etag, compressible, encoded)
+    if encoded:
+        payload = gzipped if gzipped is not None else gzip.compress(payload, compresslevel=5, mtime=0)
+    return Encoded(payload, etag, compressible, encoded)
+
+
+def encode_json(obj: dict, accept_encoding: str | None, if_none_match: str | None = None, revalidate: bool = False) -> Encoded:
+    body = json.dumps(obj, separators=(",", ":")).encode()
+    return encode_body(body, accept_encoding, if_none_match, make_etag(body) if revalidate else None)
 
 
 class Handler(BaseHTTPRequestHandler):
-    def _send(self, status: int, payload: bytes, ctype: str = "text/html") -> None:
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are dropped after this many seconds.
+    timeout = 20
+
+    def _send(
+        self,
+        status: int,
+        payload: bytes,
+        ctype: str = "text/html",
+        cache: str = "no-store",
+        etag: str | None = None,
+        gzipped: bytes | None = None,
+    ) -> None:
+        encoded = encode_body(payload, self.headers.get("Accept-Encoding"), self.headers.get("If-None-Match"), etag, gzipped)
+        self._send_encoded(status, encoded, ctype, cache)
+
+    def _send_encoded(self, status: int, encoded: Encoded, ctype: str, cache: str) -> None:
+        if encoded.body is None:
+            self.send_response(304)
+            self.send_header("ETag", encoded.etag)
+            self.send_header("Cache-Control", cache)
+            if encoded.compressible:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
         self.send_response(status)
         self.send_header("Content-Type", ctype)
-        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", cache)
+        if encoded.etag is not None:
+            self.send_header("ETag", encoded.etag)
+        if encoded.compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoded.gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(encoded.body)))
         self.end_headers()
-        self.wfile.write(payload)
+        self.wfile.write(encoded.body)
+
+    def _json(self, obj: dict, revalidate: bool = False) -> None:
+        encoded = encode_json(obj, self.headers.get("Accept-Encoding"), self.headers.get("If-None-Match"), revalidate)
+        self._send_encoded(200, encoded, "application/json", "no-cache" if revalidate else "no-store")
+
+    def _world_id(self) -> str:
+        return parse_qs(urlparse(self.path).query).get("world", [DEFAULT_WORLD])[0]
 
-    def _json(self, obj: dict) -> None:
-        self._send(200, json.dumps(obj).encode(), "application/json")
+    def _open_world(self) -> AbstractContextManager[WorldSession]:
+        # Only the default world is created implicitly; others need POST /api/worlds.
+        world_id = self._world_id()
+        return REGISTRY.session(world_id, create=world_id == DEFAULT_WORLD)
 
     def do_GET(self) -> None:
         path = urlparse(self.path).path
-        if path == "/":
-            return self._send(200, (ROOT / "templates" / "editor.html").read_bytes())
-        if path == "/play":
-            return self._send(200, (ROOT / "templates" / "play.html").read_bytes())
-        if path == "/static/editor.js":
-            return self._send(200, (ROOT / "static" / "editor.js").read_bytes(), "application/javascript")
+        if path in ASSET_ROUTES:
+            asset = ASSETS.get(*ASSET_ROUTES[path])
+            return self._send(200, asset.body, asset.ctype, cache="no-cache", etag=asset.etag, gzipped=asset.gzipped)
         if path == "/api/world":
-            return self._json(
-                {
-                    "tick": SIM.world.tick,
-                    "terrain": [{"q": q, "r": r, "t": t} for (q, r), t in SIM.world.terrain.items()],
-                    "sites": [{"id": s.id, "kind": s.kind, "q": s.hex[0], "r": s.hex[1]} for s in SIM.world.sites.values()],
-                    "spawners": [{"id": s.id, "q": s.hex[0], "r": s.hex[1], "table": s.encounter_table_id} for s in SIM.world.spawners.values()],
-                    "routes": [{"id": p.id, "points": p.points} for p in SIM.world.patrol_routes.values()],
-                    "rumors": [r.text for r in SIM.world.rumors.values()],
-                    "tracks": [{"id": t.id, "q": t.hex[0], "r": t.hex[1], "e": t.evidence_type} for t in SIM.world.tracks.values()],
-                    "regional_unrest": SIM.world.regional_unrest,
-                }
-            )
+            try:
+                with self._open_world() as session:
+                    payload = world_payload(session.sim)
+            except ValueError as exc:
+                return self._send(400, str(exc).encode(), "text/plain")
+            except UnknownWorldError:
+                return self._send(404, b"unknown world", "text/plain")
+            return self._json(payload, revalidate=True)
         self._send(404, b"not found", "text/plain")
 
     def do_POST(self) -> None:
         path = urlparse(self.path).path
         length = int(self.headers.get("Content-Length", "0"))
         data = json.loads(self.rfile.read(length) or b"{}")
+        if path == "/api/worlds":
+            try:
+                created = REGISTRY.create(str(data.get("id", "")))
+            except ValueError as exc:
+                return self._send(400, str(exc).encode(), "text/plain")
+            return self._json({"ok": True, "id": data["id"], "created": created})
+        if path not in COMMAND_ROUTES:
+            return self._send(404, b"not found", "text/plain")
+        try:
+            with self._open_world() as session:
+                response = self._command(path, data, session)
+        except ValueError as exc:
+            return self._send(400, str(exc).encode(), "text/plain")
+        except UnknownWorldError:
+            return self._send(404, b"unknown world", "text/plain")
+        self._json(response)
 
+    def _command(self, path: str, data: dict, session: WorldSession) -> dict:
+        sim = session.sim
         if path == "/api/paint":
-            SIM.paint_terrain((data["q"], data["r"]), data["terrain"])
-            return self._json({"ok": True})
+            sim.paint_terrain((data["q"], data["r"]), data["terrain"])
+            return {"ok": True}
         if path == "/api/site":
-            sid = SIM.place_site(data.get("kind", "dungeon"), (data["q"], data["r"]))
-            return self._json({"ok": True, "id": sid})
+            sid = sim.place_site(data.get("kind", "dungeon"), (data["q"], data["r"]))
+            return {"ok": True, "id": sim.ids.name(sid)}
         if path == "/api/spawner":
-            sid = SIM.place_spawner((data["q"], data["r"]), data.get("table", "wilds_basic"), 20)
-            return self._json({"ok": True, "id": sid})
+            sid = sim.place_spawner(
+                (data["q"], data["r"]),
+                data.get("table", "wilds_basic"),
+                int(data.get("interval_ticks", 20)),
+                int(data["max_population"]) if "max_population" in data else None,
+                data.get("cap_policy", "hold"),
+            )
+            return {"ok": True, "id": sim.ids.name(sid)}
         if path == "/api/route":
-            rid = SIM.add_patrol_route([(data["q1"], data["r1"]), (data["q2"], data["r2"])])
-            return self._json({"ok": True, "id": rid})
+            rid = sim.add_patrol_route([(data["q1"], data["r1"]), (data["q2"], data["r2"])])
+            return {"ok": True, "id": sim.ids.name(rid)}
         if path == "/api/encounter":
-            CONTENT.encounter_tables[data["id"]].entries[0].weight = int(data["first_weight"])
-            return self._json({"ok": True})
+            sim.update_encounter_weight(data["id"], int(data["first_weight"]))
+            return {"ok": True}
         if path == "/api/rumor-template":
-            SIM.update_rumor_template(data["id"], int(data["ttl_ticks"]), int(data["max_hops"]))
-            return self._json({"ok": True})
+            sim.update_rumor_template(data["id"], int(data["ttl_ticks"]), int(data["max_hops"]))
+            return {"ok": True}
         if path == "/api/weapon":
-            SIM.update_weapon(data["id"], int(data["penetration"]))
-            return self._json({"ok": True})
+            sim.update_weapon(data["id"], int(data["penetration"]))
+            return {"ok": True}
         if path == "/api/armor":
-            SIM.update_armor_threshold(data["armor_id"], data["damage_type"], data["arc"], int(data["value"]))
-            return self._json({"ok": True})
+            sim.update_armor_threshold(data["armor_id"], data["damage_type"], data["arc"], int(data["value"]))
+            return {"ok": True}
         if path == "/api/wound":
-            SIM.update_wound_type(data["id"], int(data["mobility_delta"]), int(data["dexterity_delta"]))
-            return self._json({"ok": True})
+            sim.update_wound_type(data["id"], int(data["mobility_delta"]), int(data["dexterity_delta"]))
+            return {"ok": True}
         if path == "/api/faction":
-            SIM.update_faction_settlement(data["id"], data["settlement"])
-            return self._json({"ok": True})
+            sim.update_faction_settlement(data["id"], data["settlement"])
+            return {"ok": True}
         if path == "/api/simulate":
-            SIM.simulate_days(int(data.get("days", 1)))
-            return self._json({"ok": True, "tick": SIM.world.tick})
+            sim.simulate_days(int(data.get("days", 1)))
+            return {"ok": True, "tick": sim.world.tick}
         if path == "/api/play":
-            SIM.tick(6)
-            event_id = SIM.create_world_event("raid", (1, 1), PLAYER_ID, (2, 2), ["tracks", "bodies"])
-            first_track_id = next(iter(SIM.world.tracks))
-            SIM.discover_track(PLAYER_ID, first_track_id)
-            SIM.validate_track(PLAYER_ID, first_track_id)
-            return self._json({"ok": True, "event_id": event_id})
-
-        self._send(404, b"not found", "text/plain")
+            sim.tick(6)
+            event_id = sim.create_world_event("raid", (1, 1), session.player_id, (2, 2), ["tracks", "bodies"])
+            first_track_id = next(iter(sim.world.tracks))
+            sim.discover_track(session.player_id, first_track_id)
+            sim.validate_track(session.player_id, first_track_id)
+            return {"ok": True, "event_id": sim.ids.name(event_id)}
+        raise AssertionError(f"unhandled command route {path}")
 
 
 def main() -> None:
-    HTTPServer(("0.0.0.0", 8000), Handler).serve_forever()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        ThreadingHTTPServer(("0.0.0.0", 8000), Handler).serve_forever()
+    finally:
+        REGISTRY.flush()
 
 
 if __name__ == "__main__":
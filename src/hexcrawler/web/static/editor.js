@@ -3,11 +3,11 @@ const grid = document.getElementById('grid');
 const log = document.getElementById('log');
 
 async function api(path, data){
-  return fetch(path, {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(data)}).then(r=>r.json());
+  return fetch(path + location.search, {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(data)}).then(r=>r.json());
 }
 
 async function refresh(){
-  const w = await fetch('/api/world').then(r=>r.json());
+  const w = await fetch('/api/world' + location.search).then(r=>r.json());
   grid.innerHTML='';
   for (const cell of w.terrain){
     const d = document.createElement('button');
@@ -39,4 +39,5 @@ async function saveWound(){ await api('/api/wound',{id:'slash', mobility_delta:d
 async function saveFaction(){ await api('/api/faction',{id:'settlers', settlement:document.getElementById('settlement').value}); await refresh(); }
 async function simulateDays(){ await api('/api/simulate',{days:document.getElementById('days').value}); await refresh(); }
 
+for (const a of document.querySelectorAll('a[href="/play"]')) a.href += location.search;
 refresh();
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import queue
+import re
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from hexcrawler.content.loader import ContentIndex
+from hexcrawler.sim import Handle, Simulation, simulation_from_dict, simulation_to_dict, write_json_atomic
+
+WORLD_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class UnknownWorldError(LookupError):
+    pass
+
+
+@dataclass
+class WorldSession:
+    world_id: str
+    sim: Simulation
+    player_id: Handle
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    users: int = 0
+    pending_saves: int = 0
+
+
+class WorldRegistry:
+    """Resident worlds keyed by id, evicted to ``store_dir`` in LRU order.
+
+    Disk I/O never happens under the registry lock. A world being read or
+    created sits in ``_loading`` and other requests for it wait on that
+    entry. Evicted worlds are written by a background saver thread and stay
+    in ``_evicting`` until their save lands, so a request for them picks the
+    live session back up instead of reading a half-written file. All worlds
+    start from the shared ``content``; a world copies it on its first content
+    edit (see ``Simulation._editable_content``).
+    """
+
+    def __init__(self, content: ContentIndex, store_dir: str | Path, max_resident: int = 8, seed: int = 42):
+        self.content = content
+        self.store_dir = Path(store_dir)
+        self.max_resident = max_resident
+        self.seed = seed
+        self._resident: OrderedDict[str, WorldSession] = OrderedDict()
+        self._evicting: dict[str, WorldSession] = {}
+        self._loading: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._save_queue: queue.Queue[WorldSession] = queue.Queue()
+        threading.Thread(target=self._save_loop, name="world-saver", daemon=True).start()
+
+    def _path(self, world_id: str) -> Path:
+        return self.store_dir / f"{world_id}.json"
+
+    def _create(self, world_id: str) -> WorldSession:
+        sim = Simulation(seed=self.seed, content=self.content)
+        sim.init_world()
+        return WorldSession(world_id=world_id, sim=sim, player_id=sim.spawn_entity("scout", (0, 0)))
+
+    def _restore(self, world_id: str) -> WorldSession | None:
+        path = self._path(world_id)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return WorldSession(world_id=world_id, sim=simulation_from_dict(data["simulation"], self.content), player_id=data["player_id"])
+
+    def _save(self, session: WorldSession) -> None:
+        write_json_atomic(self._path(session.world_id), {"player_id": session.player_id, "simulation": simulation_to_dict(session.sim)})
+
+    def _evict_idle(self) -> None:
+        for world_id in list(self._resident):
+            if len(self._resident) <= self.max_resident:
+                break
+            session = self._resident[world_id]
+            if session.users == 0:
+                del self._resident[world_id]
+                self._evicting[world_id] = session
+                session.pending_saves += 1
+                self._save_queue.put(session)
+
+    def _save_loop(self) -> None:
+        while True:
+            session = self._save_queue.get()
+            try:
+                self._save_evicted(session)
+            except Exception:  # keep the saver alive; the world stays in _evicting
+                traceback.print_exc()
+            finally:
+                self._save_queue.task_done()
+
+    def _save_evicted(self, session: WorldSession) -> None:
+        saved = False
+        try:
+            with session.lock:
+                with self._lock:
+                    # Skip worlds a request has taken back; they are saved on their next eviction.
+                    still_evicting = self._evicting.get(session.world_id) is session
+                if still_evicting:
+                    self._save(session)
+                saved = True
+        finally:
+            with self._lock:
+                session.pending_saves -= 1
+                # After a failed save the live session stays reachable through _evicting.
+                if saved and session.pending_saves == 0 and self._evicting.get(session.world_id) is session:
+                    del self._evicting[session.world_id]
+
+    def _admit(self, session: WorldSession) -> None:
+        self._resident[session.world_id] = session
+        self._resident.move_to_end(session.world_id)
+        self._evict_idle()
+
+    def _acquire(self, world_id: str, create: bool) -> WorldSession:
+        while True:
+            with self._lock:
+                session = self._resident.get(world_id) or self._evicting.pop(world_id, None)
+                if session is not None:
+                    session.users += 1
+                    self._admit(session)
+                    return session
+                loading = self._loading.get(world_id)
+                if loading is None:
+                    loading = self._loading[world_id] = threading.Event()
+                    break
+            loading.wait()
+        session = None
+        try:
+            session = self._restore(world_id)
+            if session is None and create:
+                session = self._create(world_id)
+        finally:
+            with self._lock:
+                del self._loading[world_id]
+                if session is not None:
+                    session.users += 1
+                    self._admit(session)
+            loading.set()
+        if session is None:
+            raise UnknownWorldError(world_id)
+        return session
+
+    def _check_id(self, world_id: str) -> None:
+        if not WORLD_ID_RE.fullmatch(world_id):
+            raise ValueError(f"Invalid world id: {world_id!r}")
+
+    def create(self, world_id: str) -> bool:
+        self._check_id(world_id)
+        with self._lock:
+            if world_id in self._resident or world_id in self._evicting or world_id in self._loading or self._path(world_id).exists():
+                return False
+            loading = self._loading[world_id] = threading.Event()
+        session = None
+        try:
+            session = self._create(world_id)
+        finally:
+            with self._lock:
+                del self._loading[world_id]
+                if session is not None:
+                    self._admit(session)
+            loading.set()
+        return True
+
+    def resident_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._resident)
+
+    @contextmanager
+    def session(self, world_id: str, create: bool = False) -> Iterator[WorldSession]:
+        self._check_id(world_id)
+        session = self._acquire(world_id, create)
+        try:
+            with session.lock:
+                yield session
+        finally:
+            with self._lock:
+                session.users -= 1
+
+    def wait_for_saves(self) -> None:
+        self._save_queue.join()
+
+    def flush(self) -> None:
+        self.wait_for_saves()
+        with self._lock:
+            sessions = list(self._resident.values()) + list(self._evicting.values())
+        for session in sessions:
+            with session.lock:
+                self._save(session)
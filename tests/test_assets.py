@@ -0,0 +1,149 @@
+import gzip
+import http.client
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from hexcrawler.content import load_content
+from hexcrawler.web import server
+from hexcrawler.web.assets import AssetCache, accepts_gzip, etag_matches
+from hexcrawler.web.worlds import WorldRegistry
+
+
+def test_asset_cache_reuses_until_file_changes(tmp_path):
+    path = tmp_path / "a.js"
+    path.write_text("console.log(1);")
+    cache = AssetCache()
+    first = cache.get(path, "application/javascript")
+    assert cache.get(path, "application/javascript") is first
+    assert gzip.decompress(first.gzipped) == first.body
+
+    path.write_text("console.log(22);")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = cache.get(path, "application/javascript")
+    assert second.body == b"console.log(22);"
+    assert second.etag != first.etag
+
+
+def test_accepts_gzip_parsing():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip; q=0.000")
+    assert not accepts_gzip("*, gzip;q=0")
+    assert accepts_gzip("*;q=0, gzip;q=0.1")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+def test_etag_matches_if_none_match():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"b-gzip"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_encode_json_negotiates_gzip_and_validators():
+    obj = {"terrain": ["plains"] * 200}
+    plain = server.encode_json(obj, None, revalidate=True)
+    packed = server.encode_json(obj, "gzip", revalidate=True)
+    assert not plain.gzipped and packed.gzipped
+    assert gzip.decompress(packed.body) == plain.body
+    assert packed.etag == plain.etag[:-1] + '-gzip"'
+    assert server.encode_json(obj, "gzip", packed.etag, revalidate=True).body is None
+    assert server.encode_json(obj, None, packed.etag, revalidate=True).body == plain.body
+
+
+@pytest.fixture
+def http_conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "REGISTRY", WorldRegistry(load_content("data/content.json"), tmp_path))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+    yield conn
+    conn.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_assets_are_gzipped_revalidated_and_kept_alive(http_conn):
+    http_conn.request("GET", "/static/editor.js", headers={"Accept-Encoding": "gzip"})
+    resp = http_conn.getresponse()
+    body = resp.read()
+    assert resp.status == 200
+    assert resp.getheader("Content-Encoding") == "gzip"
+    assert resp.getheader("Cache-Control") == "no-cache"
+    assert gzip.decompress(body) == (server.ROOT / "static" / "editor.js").read_bytes()
+    etag = resp.getheader("ETag")
+
+    assert etag.endswith('-gzip"')
+
+    http_conn.request("GET", "/static/editor.js")
+    resp = http_conn.getresponse()
+    identity_etag = resp.getheader("ETag")
+    assert resp.read() == (server.ROOT / "static" / "editor.js").read_bytes()
+    assert identity_etag != etag
+
+    # Each validator only matches its own representation.
+    http_conn.request("GET", "/static/editor.js", headers={"If-None-Match": etag})
+    resp = http_conn.getresponse()
+    assert resp.status == 200
+    assert resp.read() == (server.ROOT / "static" / "editor.js").read_bytes()
+
+    http_conn.request("GET", "/static/editor.js", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    resp = http_conn.getresponse()
+    assert resp.status == 304
+    assert resp.read() == b""
+    assert resp.getheader("ETag") == etag
+    assert resp.getheader("Vary") == "Accept-Encoding"
+
+    http_conn.request("GET", "/static/editor.js", headers={"If-None-Match": f"W/{identity_etag}"})
+    resp = http_conn.getresponse()
+    assert resp.status == 304
+    assert resp.read() == b""
+    assert resp.getheader("ETag") == identity_etag
+
+
+def test_world_json_is_compressed_and_supports_etags(http_conn):
+    http_conn.request("POST", "/api/worlds", body=b'{"id": "t1"}')
+    assert http_conn.getresponse().read() == b'{"ok":true,"id":"t1","created":true}'
+    http_conn.request("GET", "/api/world?world=t1", headers={"Accept-Encoding": "gzip"})
+    resp = http_conn.getresponse()
+    payload = gzip.decompress(resp.read())
+    assert resp.getheader("Content-Encoding") == "gzip"
+    assert payload.startswith(b'{"tick":0')
+    etag = resp.getheader("ETag")
+
+    http_conn.request("GET", "/api/world?world=t1", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    resp = http_conn.getresponse()
+    resp.read()
+    assert resp.status == 304
+
+    http_conn.request("POST", "/api/paint?world=t1", body=b'{"q": 0, "r": 0, "terrain": "forest"}')
+    resp = http_conn.getresponse()
+    assert resp.read() == b'{"ok":true}'
+    assert resp.getheader("Cache-Control") == "no-store"
+
+    http_conn.request("GET", "/api/world?world=t1", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    resp = http_conn.getresponse()
+    resp.read()
+    assert resp.status == 200
+
+
+def test_unknown_worlds_and_routes_do_not_create_worlds(http_conn):
+    http_conn.request("GET", "/api/world?world=nobody")
+    resp = http_conn.getresponse()
+    resp.read()
+    assert resp.status == 404
+
+    http_conn.request("POST", "/api/nope?world=nobody", body=b"{}")
+    resp = http_conn.getresponse()
+    resp.read()
+    assert resp.status == 404
+    assert server.REGISTRY.resident_ids() == []
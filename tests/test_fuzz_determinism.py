@@ -0,0 +1,60 @@
+from hexcrawler.content import load_content
+from hexcrawler.sim import SimConfig, Simulation
+from hexcrawler.sim.fuzz import ENGINE_PATHS, find_divergence, fuzz, generate_commands, run_commands, state_digest
+
+
+def test_generator_is_seeded():
+    content = load_content("data/content.json")
+    assert generate_commands(3, 50, content) == generate_commands(3, 50, content)
+    assert generate_commands(3, 50, content) != generate_commands(4, 50, content)
+
+
+def test_digest_covers_content_and_spawner_settings():
+    sim = Simulation(seed=1, content=load_content("data/content.json"))
+    sim.init_world()
+    spawner = sim.world.spawners[sim.place_spawner((1, 1), "wilds_basic", 20)]
+    before = state_digest(sim)
+    spawner.cap_policy = "recycle"
+    after_policy = state_digest(sim)
+    sim.update_weapon("spear", 12)
+    assert len({before, after_policy, state_digest(sim)}) == 3
+
+
+def test_random_scenarios_agree_across_engine_paths():
+    content = load_content("data/content.json")
+    assert fuzz(range(25), 100, content) == []
+
+
+def test_divergent_engine_path_is_detected_and_shrunk():
+    content = load_content("data/content.json")
+    paths = {**ENGINE_PATHS, "capped": lambda cmds, seed, c: run_commands(cmds, seed, c, SimConfig(spawner_population_cap=2))}
+    failures = fuzz(range(10), 80, content, paths)
+
+    assert failures
+    for failure in failures:
+        assert failure.kind == "capped"
+        assert failure.reason.startswith("capped diverges")
+        assert [cmd[0] for cmd in failure.commands] == ["spawner", "tick", "checkpoint"]
+        assert find_divergence(failure.commands, failure.seed, content, paths) is not None
+        assert find_divergence(failure.commands, failure.seed, content) is None
+
+
+def test_shrinking_keeps_the_original_failure_kind():
+    content = load_content("data/content.json")
+
+    def crashes_when_tiny(cmds, seed, c):
+        if len(cmds) <= 2:
+            raise RuntimeError("unrelated crash")
+        return run_commands(cmds, seed, c)
+
+    paths = {
+        **ENGINE_PATHS,
+        "capped": lambda cmds, seed, c: run_commands(cmds, seed, c, SimConfig(spawner_population_cap=2)),
+        "crashy": crashes_when_tiny,
+    }
+    failures = fuzz(range(10), 80, content, paths)
+
+    assert failures
+    for failure in failures:
+        assert failure.kind == "capped"
+        assert [cmd[0] for cmd in failure.commands] == ["spawner", "tick", "checkpoint"]
@@ -0,0 +1,82 @@
+import pytest
+
+from hexcrawler.content import load_content
+from hexcrawler.sim import IdTable, Simulation
+from hexcrawler.web.server import world_payload
+
+
+def test_generated_handles_round_trip_through_display_names():
+    ids = IdTable()
+    ent = ids.new("ent")
+    track = ids.new("track")
+    assert ent < track
+    assert ids.name(ent) == "ent_1"
+    assert ids.name(track) == "track_2"
+    assert ids.parse("track_2") == track
+    assert ids.parse(ids.name(ent)) == ent
+
+
+def test_interned_strings_get_stable_negative_handles():
+    ids = IdTable()
+    hop = ids.intern("hop_1")
+    assert hop < 0
+    assert ids.intern("hop_1") == hop
+    assert ids.name(hop) == "hop_1"
+    assert ids.parse("hop_1") == hop
+
+
+@pytest.mark.parametrize("name", ["ent_2", "site_1", "ent_x", "nope"])
+def test_malformed_or_out_of_range_names_do_not_parse(name):
+    ids = IdTable()
+    ids.new("ent")
+    with pytest.raises(KeyError):
+        ids.parse(name)
+
+
+@pytest.mark.parametrize("name", ["track_1", "ent_2", "ent_99", "site_1", "hop_1", "nope"])
+def test_resolve_rejects_names_that_were_never_issued(name):
+    sim = Simulation(seed=5, content=load_content("data/content.json"))
+    sim.init_world()
+    actor = sim.spawn_entity("scout", (0, 0))
+    sim.create_world_event("ambush", (0, 0), actor, (1, 1), ["tracks"])
+    assert sim.resolve("ent_1") == actor
+    assert sim.resolve("track_3") in sim.world.tracks
+    with pytest.raises(KeyError):
+        sim.resolve(name)
+
+
+def test_resolve_rejects_removed_entities():
+    sim = Simulation(seed=5, content=load_content("data/content.json"))
+    sim.init_world()
+    ent = sim.spawn_entity("scout", (0, 0))
+    sim.remove_entity(ent)
+    with pytest.raises(KeyError):
+        sim.resolve("ent_1")
+
+
+def test_table_size_is_bounded_by_prefixes_not_allocations():
+    ids = IdTable()
+    for _ in range(10_000):
+        ids.new("ent")
+        ids.new("track")
+    assert len(ids.to_dict()["prefixes"]) == 2
+    assert ids.name(ids.parse("track_20000")) == "track_20000"
+
+
+def test_world_uses_int_handles_and_api_uses_names():
+    content = load_content("data/content.json")
+    sim = Simulation(seed=5, content=content)
+    sim.init_world()
+    actor = sim.spawn_entity("scout", (0, 0))
+    sim.place_site("town", (1, 1))
+    sim.create_world_event("raid", (0, 0), actor, (2, 2), ["tracks"])
+    sim.tick(150)
+
+    assert all(isinstance(k, int) for k in sim.world.entities)
+    rumor = next(iter(sim.world.rumors.values()))
+    assert actor in rumor.known_by
+    assert sim.ids.name(min(rumor.known_by)).startswith("hop_")
+
+    payload = world_payload(sim)
+    assert payload["sites"][0]["id"] == "site_2"
+    assert payload["tracks"][0]["id"] == "track_4"
@@ -1,5 +1,5 @@
 from hexcrawler.content import load_content
-from hexcrawler.sim import Simulation
+from hexcrawler.sim import Simulation, load_simulation, save_simulation
 
 
 def test_world_persists_without_player_entity():
@@ -14,3 +14,40 @@ def test_world_persists_without_player_entity():
 
     assert sim.world.tick == 20
     assert len(sim.world.entities) > 0
+
+
+def test_save_and_load_round_trip_continues_identically(tmp_path):
+    content = load_content("data/content.json")
+    sim = Simulation(seed=21, content=content)
+    sim.init_world()
+    actor = sim.spawn_entity("raider", (0, 0))
+    target = sim.spawn_entity("scout", (1, 0))
+    sim.place_spawner((2, 2), "wilds_basic", interval_ticks=5, max_population=4, cap_policy="recycle")
+    sim.place_site("ruin", (3, 3))
+    sim.add_patrol_route([(0, 0), (4, 4)])
+    sim.attack(actor, target, arc="rear")
+    sim.create_world_event("raid", (0, 0), actor, (4, 4), ["tracks", "bodies"])
+    sim.update_weapon("axe", 9)
+    sim.tick(200)
+
+    save_simulation(sim, tmp_path / "world.json")
+    restored = load_simulation(tmp_path / "world.json", content)
+    assert restored.world.snapshot() == sim.world.snapshot()
+    assert restored.content.weapons["axe"].penetration == 9
+
+    sim.attack(actor, target)
+    restored.attack(actor, target)
+    sim.tick(300)
+    restored.tick(300)
+    assert restored.world.snapshot() == sim.world.snapshot()
+    assert restored.ids.name(target) == "ent_2"
+
+
+def test_content_edits_do_not_leak_between_simulations():
+    content = load_content("data/content.json")
+    a = Simulation(seed=1, content=content)
+    b = Simulation(seed=1, content=content)
+    a.update_weapon("spear", 99)
+
+    assert a.content.weapons["spear"].penetration == 99
+    assert b.content.weapons["spear"].penetration == content.weapons["spear"].penetration != 99
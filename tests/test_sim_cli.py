@@ -0,0 +1,49 @@
+import json
+
+from hexcrawler.content import load_content
+from hexcrawler.sim import Simulation, load_simulation, save_simulation
+from hexcrawler.sim.cli import main
+
+
+def test_cli_ages_saved_world_with_checkpoints(tmp_path, capsys):
+    content = load_content("data/content.json")
+    sim = Simulation(seed=8, content=content)
+    sim.init_world()
+    sim.place_spawner((1, 1), "wilds_basic", interval_ticks=20)
+    save_simulation(sim, tmp_path / "world.json")
+
+    code = main([
+        "--world", str(tmp_path / "world.json"),
+        "--days", "2",
+        "--checkpoint-every", "1",
+        "--checkpoint-dir", str(tmp_path / "ckpt"),
+        "--out", str(tmp_path / "aged.json"),
+        "--summary", str(tmp_path / "summary.json"),
+    ])
+
+    assert code == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary == json.loads((tmp_path / "summary.json").read_text())
+    assert summary["ticks"] == 2 * 24 * 60 * 6
+    assert summary["ticks_per_second"] > 0
+    assert len(summary["checkpoints"]) == 2
+    assert summary["checkpoint_seconds"] > 0
+
+    sim.simulate_days(2)
+    aged = load_simulation(tmp_path / "aged.json", content)
+    assert aged.world.snapshot() == sim.world.snapshot()
+    assert load_simulation(summary["checkpoints"][-1], content).world.snapshot() == sim.world.snapshot()
+
+
+def test_cli_preserves_registry_envelope(tmp_path, capsys):
+    content = load_content("data/content.json")
+    sim = Simulation(seed=8, content=content)
+    sim.init_world()
+    save_simulation(sim, tmp_path / "inner.json")
+    envelope = {"player_id": 1, "simulation": json.loads((tmp_path / "inner.json").read_text())}
+    (tmp_path / "w.json").write_text(json.dumps(envelope))
+
+    assert main(["--world", str(tmp_path / "w.json"), "--days", "1", "--out", str(tmp_path / "w.json")]) == 0
+    saved = json.loads((tmp_path / "w.json").read_text())
+    assert saved["player_id"] == 1
+    assert saved["simulation"]["world"]["tick"] == 24 * 60 * 6
@@ -0,0 +1,59 @@
+from hexcrawler.content import load_content
+from hexcrawler.sim import SimConfig, Simulation
+
+
+def test_spawner_holds_at_population_cap():
+    content = load_content("data/content.json")
+    sim = Simulation(seed=11, content=content)
+    sim.init_world()
+    sid = sim.place_spawner((2, 2), "wilds_basic", interval_ticks=5, max_population=3)
+    sim.tick(200)
+
+    spawner = sim.world.spawners[sid]
+    assert len(spawner.population) == 3
+    assert len(sim.world.entities) == 3
+    assert all(sim.world.entities[eid].spawner_id == sid for eid in spawner.population)
+
+
+def test_recycle_policy_replaces_oldest_and_reuses_records():
+    content = load_content("data/content.json")
+    sim = Simulation(seed=11, content=content)
+    sim.init_world()
+    sid = sim.place_spawner((2, 2), "wilds_basic", interval_ticks=5, max_population=2, cap_policy="recycle")
+    sim.tick(10)
+    spawner = sim.world.spawners[sid]
+    first_id = spawner.population[0]
+    records = {id(e) for e in sim.world.entities.values()}
+
+    sim.tick(50)
+    assert len(spawner.population) == 2
+    assert first_id not in sim.world.entities
+    assert {id(e) for e in sim.world.entities.values()} == records
+
+
+def test_region_cap_limits_all_spawners_in_region():
+    content = load_content("data/content.json")
+    sim = Simulation(seed=11, content=content, config=SimConfig(region_population_cap=4))
+    sim.init_world()
+    sim.place_spawner((0, 0), "wilds_basic", interval_ticks=5)
+    sim.place_spawner((1, 1), "wilds_basic", interval_ticks=5)
+    sim.place_spawner((8, 8), "wilds_basic", interval_ticks=5, max_population=2)
+    sim.tick(300)
+
+    in_first_region = [e for e in sim.world.entities.values() if e.hex in ((0, 0), (1, 1))]
+    assert len(in_first_region) == 4
+    assert len(sim.world.entities) == 6
+
+
+def test_removed_entity_leaves_spawner_population():
+    content = load_content("data/content.json")
+    sim = Simulation(seed=11, content=content)
+    sim.init_world()
+    sid = sim.place_spawner((2, 2), "wilds_basic", interval_ticks=5, max_population=2)
+    sim.tick(10)
+    victim = sim.world.spawners[sid].population[0]
+
+    sim.remove_entity(victim)
+    assert victim not in sim.world.spawners[sid].population
+    sim.tick(5)
+    assert len(sim.world.spawners[sid].population) == 2
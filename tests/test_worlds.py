@@ -0,0 +1,208 @@
+import threading
+
+import pytest
+
+from hexcrawler.content import load_content
+from hexcrawler.web.worlds import UnknownWorldError, WorldRegistry
+
+
+def test_worlds_are_isolated_and_share_content(tmp_path):
+    content = load_content("data/content.json")
+    registry = WorldRegistry(content, tmp_path, max_resident=4)
+    with registry.session("alpha", create=True) as alpha:
+        alpha.sim.tick(30)
+        alpha.sim.update_weapon("spear", 12)
+    with registry.session("beta", create=True) as beta:
+        assert beta.sim.world.tick == 0
+        assert beta.sim.content is content
+        assert beta.sim.content.weapons["spear"].penetration != 12
+
+
+def test_lru_world_is_evicted_to_disk_and_restored(tmp_path):
+    content = load_content("data/content.json")
+    registry = WorldRegistry(content, tmp_path, max_resident=2)
+    with registry.session("a", create=True) as s:
+        s.sim.place_site("town", (2, 2))
+        s.sim.update_weapon("axe", 1)
+        s.sim.tick(40)
+        before = s.sim.world.snapshot()
+        player = s.player_id
+    with registry.session("b", create=True):
+        pass
+    with registry.session("c", create=True):
+        pass
+
+    assert registry.resident_ids() == ["b", "c"]
+    registry.wait_for_saves()
+    assert (tmp_path / "a.json").exists()
+    with registry.session("a") as s:
+        assert s.sim.world.snapshot() == before
+        assert s.player_id == player
+        assert s.sim.content.weapons["axe"].penetration == 1
+    assert registry.resident_ids() == ["c", "a"]
+
+
+def test_busy_world_is_not_evicted(tmp_path):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path, max_resident=1)
+    with registry.session("busy", create=True):
+        with registry.session("other", create=True):
+            assert set(registry.resident_ids()) == {"busy", "other"}
+    with registry.session("third", create=True):
+        pass
+    assert registry.resident_ids() == ["third"]
+
+
+def test_concurrent_sessions_serialize_per_world(tmp_path):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path, max_resident=2)
+
+    def work(world_id: str) -> None:
+        for _ in range(20):
+            with registry.session(world_id, create=True) as s:
+                s.sim.tick(1)
+
+    threads = [threading.Thread(target=work, args=(w,)) for w in ("x", "x", "y", "z")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    registry.flush()
+    ticks = {}
+    for w in ("x", "y", "z"):
+        with registry.session(w) as s:
+            ticks[w] = s.sim.world.tick
+    assert ticks == {"x": 40, "y": 20, "z": 20}
+
+
+def test_invalid_world_id_is_rejected(tmp_path):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path)
+    with pytest.raises(ValueError):
+        with registry.session("../etc", create=True):
+            pass
+
+
+def test_invalid_content_edit_is_rejected_and_world_still_restores(tmp_path):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path, max_resident=1)
+    with registry.session("edited", create=True) as s:
+        with pytest.raises(ValueError):
+            s.sim.update_rumor_template("raid_rumor", 10, 7)
+        with pytest.raises(ValueError):
+            s.sim.update_encounter_weight("wilds_basic", -1)
+        s.sim.update_rumor_template("raid_rumor", 10, 5)
+    with registry.session("other", create=True):
+        pass
+
+    with registry.session("edited") as s:
+        assert s.sim.content.rumor_templates["raid_rumor"].max_hops == 5
+
+
+def test_eviction_saves_outside_registry_lock_and_live_session_is_reused(tmp_path, monkeypatch):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path, max_resident=1)
+    with registry.session("slow", create=True) as s:
+        slow_sim = s.sim
+    saving, release = threading.Event(), threading.Event()
+    real_save = registry._save
+
+    def blocking_save(session):
+        saving.set()
+        release.wait(5)
+        real_save(session)
+
+    monkeypatch.setattr(registry, "_save", blocking_save)
+    evictor = threading.Thread(target=lambda: registry.session("next", create=True).__enter__())
+    evictor.start()
+    assert saving.wait(5)
+
+    # The registry lock is free while "slow" is being written.
+    assert registry.resident_ids() == ["next"]
+    seen = []
+    reopen = threading.Thread(target=lambda: seen.append(registry.session("slow").__enter__().sim))
+    reopen.start()
+    release.set()
+    evictor.join(5)
+    reopen.join(5)
+    assert seen == [slow_sim]
+
+
+def test_resurrected_world_does_not_block_requests_or_get_a_stale_save(tmp_path, monkeypatch):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path, max_resident=1)
+    gate = threading.Event()
+    real_save = registry._save
+
+    def gated_save(session):
+        if session.world_id == "first":
+            gate.wait(5)
+        real_save(session)
+
+    monkeypatch.setattr(registry, "_save", gated_save)
+    registry.create("first")
+    registry.create("revived")
+    registry.create("idle")  # queues "revived" behind the stalled save of "first"
+
+    entered, leave = threading.Event(), threading.Event()
+
+    def hold_revived():
+        with registry.session("revived"):
+            entered.set()
+            leave.wait(5)
+
+    holder = threading.Thread(target=hold_revived)
+    holder.start()
+    assert entered.wait(5)
+    gate.set()
+
+    # The saver waits on "revived", but requests for other worlds still go through.
+    with registry.session("other", create=True) as s:
+        assert s.sim.world.tick == 0
+    leave.set()
+    holder.join(5)
+    registry.wait_for_saves()
+    assert not (tmp_path / "revived.json").exists()
+    assert (tmp_path / "idle.json").exists()
+
+
+def test_worlds_are_only_created_explicitly(tmp_path):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path)
+    with pytest.raises(UnknownWorldError):
+        with registry.session("ghost"):
+            pass
+    assert registry.resident_ids() == []
+
+    assert registry.create("ghost")
+    assert not registry.create("ghost")
+    with registry.session("ghost") as s:
+        assert s.sim.world.tick == 0
+
+
+def test_restore_happens_outside_registry_lock(tmp_path, monkeypatch):
+    registry = WorldRegistry(load_content("data/content.json"), tmp_path, max_resident=1)
+    registry.create("cold")
+    registry.create("warm")
+    registry.wait_for_saves()
+    assert registry.resident_ids() == ["warm"]
+    loading, release = threading.Event(), threading.Event()
+    real_restore = registry._restore
+
+    def slow_restore(world_id):
+        loading.set()
+        release.wait(5)
+        return real_restore(world_id)
+
+    monkeypatch.setattr(registry, "_restore", slow_restore)
+    sims = []
+
+    def open_cold():
+        with registry.session("cold") as s:
+            sims.append(s.sim)
+
+    readers = [threading.Thread(target=open_cold) for _ in range(2)]
+    for t in readers:
+        t.start()
+    assert loading.wait(5)
+
+    # Another world is served while "cold" is still being read from disk.
+    with registry.session("warm") as s:
+        assert s.sim.world.tick == 0
+    release.set()
+    for t in readers:
+        t.join(5)
+    assert len(sims) == 2 and sims[0] is sims[1]